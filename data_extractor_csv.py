@@ -5,6 +5,15 @@ from pathlib import Path
 import pandas as pd
 from collections import defaultdict
 
+# Hitbox fields that describe what a hit does rather than where/when it is. Rows of
+# the same move repeat these heavily, so they are interned into a shared table.
+HITBOX_PARAM_FIELDS = [
+    "damage", "angle", "bkb", "kbg", "fkb", "setweight", "effect", "sfxlevel", "sfxtype",
+    "kind", "type", "hitlag", "sdi", "shielddamage", "facingrestrict", "ground_or_air",
+    "trip", "rehit", "clang_rebound", "direct_hitbox", "disablehitlag", "flinchless",
+    "friendlyfire", "absorbable", "reflectable", "hitbits", "collisionpart", "unk"
+]
+
 def load_character_data():
     """
     Load character data from the cloned Ultimate Hitboxes repository.
@@ -147,6 +156,7 @@ def analyze_data_structure(character_data, character_attributes):
 def prepare_data_for_csv(character_data, character_attributes, structure):
     """
     Prepare the data for CSV export.
+    Hitbox rows reference their damage/knockback parameters by param_id in hitbox_params.
     """
     print("\nPreparing data for CSV export...")
     
@@ -243,6 +253,12 @@ def prepare_data_for_csv(character_data, character_attributes, structure):
     hitbox_rows = []
     throw_rows = []
     
+    # Distinct hitbox parameter tuples, mapped to their param_id
+    param_fields = [field for field in structure["hitbox_fields"] if field in HITBOX_PARAM_FIELDS]
+    row_fields = [field for field in structure["hitbox_fields"] if field not in HITBOX_PARAM_FIELDS]
+    param_ids = {}
+    hitbox_param_rows = []
+    
     for char_name, char_data in character_data.items():
         # Skip non-character data files
         if char_name in ['items', 'todo'] or not isinstance(char_data, dict):
@@ -279,11 +295,21 @@ def prepare_data_for_csv(character_data, character_attributes, structure):
                             "hitbox_index": hitbox_idx,
                             "move_name": move.get("name", "")
                         }
-                        for field in structure["hitbox_fields"]:
+                        for field in row_fields:
                             if field in hitbox:
                                 hitbox_row[field] = hitbox[field]
                             else:
                                 hitbox_row[field] = None
+                        
+                        # Reference the shared parameter row, adding it if it's new
+                        params = tuple(hitbox.get(field) for field in param_fields)
+                        param_key = json.dumps(params, sort_keys=True, default=str)
+                        if param_key not in param_ids:
+                            param_ids[param_key] = len(hitbox_param_rows)
+                            param_row = {"param_id": param_ids[param_key]}
+                            param_row.update(zip(param_fields, params))
+                            hitbox_param_rows.append(param_row)
+                        hitbox_row["param_id"] = param_ids[param_key]
                         hitbox_rows.append(hitbox_row)
                 
                 # Add throw data
@@ -310,6 +336,7 @@ def prepare_data_for_csv(character_data, character_attributes, structure):
         "characters": character_rows,
         "moves": move_rows,
         "hitboxes": hitbox_rows,
+        "hitbox_params": hitbox_param_rows,
         "throws": throw_rows
     }
 
@@ -348,6 +375,7 @@ if __name__ == "__main__":
     print(f"Number of characters: {len(csv_data['characters'])}")
     print(f"Number of moves: {len(csv_data['moves'])}")
     print(f"Number of hitboxes: {len(csv_data['hitboxes'])}")
+    print(f"Number of distinct hitbox parameter sets: {len(csv_data['hitbox_params'])}")
     print(f"Number of throws: {len(csv_data['throws'])}")
     
     # Preview first row of each dataset
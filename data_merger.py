@@ -4,6 +4,8 @@ import sys
 from pathlib import Path
 import pandas as pd
 
+from name_search import NameSearchIndex, build_character_entries
+
 def normalize_character_name(name):
     """
     Normalize character names by removing or replacing special characters
@@ -22,6 +24,54 @@ def normalize_character_name(name):
     normalized = ''.join(c for c in normalized if c.isalnum() or c == '-')
     return normalized
 
+def match_attribute_characters(characters_df, character_attrs, display_to_game=None):
+    """
+    Map attribute display names to character_ids.
+    
+    Exact normalized names and internal game names are matched first. Only the
+    remaining names go to the fuzzy index, which never returns a character that
+    was already matched exactly, so with Mario missing from the roster "Mario"
+    can't claim Dr. Mario's row. Names without a confident match are reported
+    and left out instead of guessed.
+    """
+    char_ids_by_name = {}
+    char_ids_by_game_name = {}
+    for _, row in characters_df.iterrows():
+        char_id = row['character_id']
+        char_name = char_id.split('_', 1)[1] if '_' in char_id else char_id
+        char_ids_by_name[normalize_character_name(char_name)] = char_id
+        if isinstance(row.get('game_name'), str):
+            char_ids_by_game_name.setdefault(row['game_name'], char_id)
+    
+    matches = {}
+    fuzzy_names = []
+    for display_name, attr_data in character_attrs.items():
+        matched_char_id = char_ids_by_name.get(normalize_character_name(display_name))
+        if not matched_char_id:
+            matched_char_id = char_ids_by_game_name.get(attr_data.get('internal_name'))
+        if matched_char_id:
+            matches[display_name] = matched_char_id
+        else:
+            fuzzy_names.append(display_name)
+    
+    # Fuzzy index over display names, file stems and game names for everything else
+    name_index = NameSearchIndex(build_character_entries(characters_df, display_to_game or None))
+    claimed = set(matches.values())
+    unresolved = []
+    for display_name in fuzzy_names:
+        matched_char_id = name_index.resolve_character(display_name, exclude=claimed)
+        if matched_char_id:
+            print(f"Matched '{display_name}' to {matched_char_id} by name similarity")
+            matches[display_name] = matched_char_id
+            claimed.add(matched_char_id)
+        else:
+            unresolved.append(display_name)
+    
+    if unresolved:
+        print(f"Warning: No confident character match for {len(unresolved)} attribute entries, "
+              f"skipping: {', '.join(unresolved)}")
+    return matches
+
 def update_characters_csv():
     """
     Update the characters.csv file with additional attributes from the SSBU-Calculator data
@@ -116,34 +166,12 @@ def update_characters_csv():
                     characters_df.loc[characters_df['character_id'] == char_id, 'game_name'] = game_name
                     break
     
+    # Resolve every attribute entry to a character_id before writing anything
+    matches = match_attribute_characters(characters_df, character_attrs, display_to_game)
+    
     # Second pass: Process character attributes
     for display_name, attr_data in character_attrs.items():
-        # Get the normalized version of this display name
-        normalized_display = normalize_character_name(display_name)
-        
-        # Try to find the corresponding character_id in our CSV
-        matched_char_id = None
-        
-        # Try multiple matching strategies
-        for _, row in characters_df.iterrows():
-            char_id = row['character_id']
-            char_name = char_id.split('_', 1)[1] if '_' in char_id else char_id
-            normalized_char = normalize_character_name(char_name)
-            
-            # Direct match
-            if normalized_char == normalized_display:
-                matched_char_id = char_id
-                break
-            
-            # Match on internal_name
-            if attr_data.get('internal_name') == row.get('game_name'):
-                matched_char_id = char_id
-                break
-            
-            # Match using normalized variants
-            if normalized_char in normalized_display or normalized_display in normalized_char:
-                matched_char_id = char_id
-                break
+        matched_char_id = matches.get(display_name)
         
         if matched_char_id:
             # We found a match, add attributes
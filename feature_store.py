@@ -0,0 +1,381 @@
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from frame_data import DATA_DIR, AERIAL_NAMES, load_table, parse_frame_list, table_hashes
+from jump_simulator import simulate_jumps
+
+FEATURE_DIR = DATA_DIR.parent / "features"
+
+# Bump whenever a feature definition changes so cached shards are not reused
+FEATURE_SET_VERSION = 1
+
+# Pairs are stored in square blocks of BLOCK_SIZE x BLOCK_SIZE characters, so a change
+# to one character only recomputes the blocks in its row and column
+BLOCK_SIZE = 8
+
+CHARACTER_FEATURES = []
+PAIR_FEATURES = []
+
+def character_feature(name):
+    """
+    Register a per-character feature. The function receives the dict of tables
+    (restricted to the characters being computed) and returns a Series indexed by character_id.
+    """
+    def register(func):
+        CHARACTER_FEATURES.append((name, func))
+        return func
+    return register
+
+def pair_feature(name):
+    """
+    Register a per-pair feature. The function receives two dicts of character feature
+    arrays, a (the player, shaped rows x 1) and b (the opponent, shaped 1 x cols),
+    and returns a rows x cols array.
+    """
+    def register(func):
+        PAIR_FEATURES.append((name, func))
+        return func
+    return register
+
+# ---------------------------------------------------------------------------
+# Character features
+# ---------------------------------------------------------------------------
+
+def _param(column):
+    def feature(tables):
+        characters = tables["characters"].set_index("character_id")
+        return pd.to_numeric(characters[column], errors="coerce")
+    return feature
+
+for _name, _column in [("weight", "param_Weight"), ("run_speed", "param_RunSpeed"),
+                       ("walk_speed", "param_WalkSpeed"), ("air_speed", "param_AirSpeed"),
+                       ("fall_speed", "param_FallSpeed"), ("fast_fall_speed", "param_FastFallSpeed"),
+                       ("gravity", "param_Gravity"), ("jumpsquat", "param_Jumpsquat"),
+                       ("shield_size", "param_ShieldSize")]:
+    character_feature(_name)(_param(_column))
+
+def _airtime(jump_type):
+    def feature(tables):
+        jumps = tables["jumps"]
+        return jumps[jumps["jump_type"] == jump_type].set_index("character_id")["airtime"]
+    return feature
+
+character_feature("short_hop_airtime")(_airtime("short_hop"))
+character_feature("full_hop_airtime")(_airtime("full_hop"))
+
+@character_feature("move_count")
+def move_count(tables):
+    return tables["moves"].groupby("character_id").size().astype(float)
+
+@character_feature("fastest_faf")
+def fastest_faf(tables):
+    moves = tables["moves"]
+    faf = pd.to_numeric(moves["faf"], errors="coerce")
+    return faf[faf > 0].groupby(moves["character_id"]).min()
+
+@character_feature("mean_aerial_faf")
+def mean_aerial_faf(tables):
+    moves = tables["moves"]
+    aerials = moves[moves["name"].isin(AERIAL_NAMES)]
+    return pd.to_numeric(aerials["faf"], errors="coerce").groupby(aerials["character_id"]).mean()
+
+@character_feature("mean_aerial_landing_lag")
+def mean_aerial_landing_lag(tables):
+    columns = ["param_NairLandingLag", "param_FairLandingLag", "param_BairLandingLag",
+               "param_UairLandingLag", "param_DairLandingLag"]
+    characters = tables["characters"].set_index("character_id")
+    return characters[columns].apply(pd.to_numeric, errors="coerce").mean(axis=1)
+
+@character_feature("fastest_startup")
+def fastest_startup(tables):
+    hitboxes = tables["hitboxes"]
+    if hitboxes is None or hitboxes.empty:
+        return pd.Series(dtype=float)
+    first = hitboxes["frames"].apply(lambda f: min(parse_frame_list(f), default=np.nan))
+    return first.groupby(hitboxes["character_id"]).min()
+
+@character_feature("max_hitbox_damage")
+def max_hitbox_damage(tables):
+    hitboxes = tables["hitboxes"]
+    if hitboxes is None or hitboxes.empty:
+        return pd.Series(dtype=float)
+    return pd.to_numeric(hitboxes["damage"], errors="coerce").groupby(hitboxes["character_id"]).max()
+
+@character_feature("max_throw_damage")
+def max_throw_damage(tables):
+    throws = tables["throws"]
+    if throws is None or throws.empty:
+        return pd.Series(dtype=float)
+    return pd.to_numeric(throws["damage"], errors="coerce").groupby(throws["character_id"]).max()
+
+@character_feature("mean_throw_kbg")
+def mean_throw_kbg(tables):
+    throws = tables["throws"]
+    if throws is None or throws.empty:
+        return pd.Series(dtype=float)
+    return pd.to_numeric(throws["kbg"], errors="coerce").groupby(throws["character_id"]).mean()
+
+# ---------------------------------------------------------------------------
+# Pair features
+# ---------------------------------------------------------------------------
+
+def _difference(feature_name):
+    def feature(a, b):
+        return a[feature_name] - b[feature_name]
+    return feature
+
+for _name, _ in list(CHARACTER_FEATURES):
+    pair_feature(f"diff_{_name}")(_difference(_name))
+
+@pair_feature("weight_ratio")
+def weight_ratio(a, b):
+    return a["weight"] / b["weight"]
+
+@pair_feature("startup_vs_opponent_jumpsquat")
+def startup_vs_opponent_jumpsquat(a, b):
+    # Positive when the player's fastest hitbox comes out before the opponent leaves the ground
+    return b["jumpsquat"] - a["fastest_startup"]
+
+@pair_feature("throw_damage_vs_opponent_weight")
+def throw_damage_vs_opponent_weight(a, b):
+    return a["max_throw_damage"] * 100.0 / b["weight"]
+
+# ---------------------------------------------------------------------------
+# Computation
+# ---------------------------------------------------------------------------
+
+def compute_character_features(tables, character_ids):
+    """
+    Compute every registered character feature for the given characters.
+    """
+    def restrict(df):
+        if df is None:
+            return None
+        return df[df["character_id"].isin(character_ids)]
+
+    restricted = {name: restrict(df) for name, df in tables.items()}
+    restricted["jumps"], _ = simulate_jumps(restricted["characters"])
+    features = pd.DataFrame(index=pd.Index(character_ids, name="character_id"))
+    for name, func in CHARACTER_FEATURES:
+        features[name] = pd.to_numeric(func(restricted), errors="coerce").reindex(features.index)
+    return features.astype(float)
+
+def compute_pair_block(row_features, col_features, out_file):
+    """
+    Compute every pair feature for one block of player x opponent characters and
+    save it as a rows x cols x features float32 array. Runs in a worker process.
+    """
+    names = [name for name, _ in CHARACTER_FEATURES]
+    a = {name: row_features[:, i][:, None] for i, name in enumerate(names)}
+    b = {name: col_features[:, i][None, :] for i, name in enumerate(names)}
+    shape = (row_features.shape[0], col_features.shape[0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        block = np.stack([np.broadcast_to(func(a, b), shape) for _, func in PAIR_FEATURES], axis=-1)
+    block = np.where(np.isfinite(block), block, np.nan).astype(np.float32)
+    tmp_file = f"{out_file}.tmp{os.getpid()}.npy"
+    np.save(tmp_file, block)
+    os.replace(tmp_file, out_file)
+    return out_file
+
+def block_key(row_hashes, col_hashes):
+    """
+    Content key of a pair block: changes only when a feature definition or one
+    of the characters in the block changes.
+    """
+    digest = hashlib.sha1(f"v{FEATURE_SET_VERSION}:{[n for n, _ in PAIR_FEATURES]}".encode("utf-8"))
+    digest.update("|".join(row_hashes).encode("utf-8"))
+    digest.update(b"/")
+    digest.update("|".join(col_hashes).encode("utf-8"))
+    return digest.hexdigest()
+
+def feature_hash(values):
+    return hashlib.sha1(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+def load_manifests(feature_dir):
+    """
+    Read the manifest of every existing version, skipping unreadable ones.
+    Returns a list of (version directory, manifest) pairs.
+    """
+    manifests = []
+    for manifest_file in Path(feature_dir).glob("*/manifest.json"):
+        try:
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                manifests.append((manifest_file.parent, json.load(f)))
+        except (OSError, ValueError):
+            continue
+    return manifests
+
+def load_previous_characters(feature_dir):
+    """
+    Collect character features from every existing version, keyed by input data hash.
+    Versions built with a different feature set are skipped.
+    """
+    feature_names = [name for name, _ in CHARACTER_FEATURES]
+    previous = {}
+    for version_dir, manifest in load_manifests(feature_dir):
+        if (manifest.get("feature_set_version") != FEATURE_SET_VERSION
+                or manifest.get("character_features") != feature_names):
+            continue
+        try:
+            values = np.load(version_dir / "characters.npy")
+        except (OSError, ValueError):
+            continue
+        for i, data_hash in enumerate(manifest["data_hashes"]):
+            previous[data_hash] = values[i]
+    return previous
+
+def build_feature_store(data_dir=DATA_DIR, feature_dir=FEATURE_DIR, version=None, max_workers=None):
+    """
+    Build the versioned feature store for the dataset in data_dir.
+
+    Layout:
+        <feature_dir>/<version>/manifest.json  - character order, feature names, block list
+        <feature_dir>/<version>/characters.npy - characters x character features
+        <feature_dir>/blocks/<key>.npy         - pair blocks, shared between versions
+
+    Character features are reused when a character's input rows are unchanged, and
+    pair blocks are reused when none of their characters' features changed.
+    """
+    feature_dir = Path(feature_dir)
+    tables = {name: load_table(name, data_dir) for name in ["characters", "moves", "hitboxes", "throws"]}
+    if tables["characters"] is None or tables["moves"] is None:
+        print("Error: characters.csv and moves.csv are required to build features.")
+        sys.exit(1)
+
+    characters_df = tables["characters"]
+    if version is None:
+        versions = characters_df["attr_version"].dropna() if "attr_version" in characters_df.columns else []
+        version = str(versions.mode().iloc[0]) if len(versions) else "unversioned"
+    character_ids = sorted(characters_df["character_id"])
+
+    # Character features, reusing rows whose inputs and feature list are unchanged
+    per_table = [table_hashes(name, data_dir) for name in tables]
+    feature_names = [name for name, _ in CHARACTER_FEATURES]
+    data_hashes = []
+    for char_id in character_ids:
+        digest = hashlib.sha1(f"v{FEATURE_SET_VERSION}:{json.dumps(feature_names)}:{char_id}".encode("utf-8"))
+        for hashes in per_table:
+            digest.update(hashes.get(char_id, "").encode("utf-8"))
+        data_hashes.append(digest.hexdigest())
+
+    previous = load_previous_characters(feature_dir)
+    stale = [c for c, h in zip(character_ids, data_hashes) if h not in previous]
+    print(f"Computing character features for {len(stale)} of {len(character_ids)} characters...")
+    fresh = compute_character_features(tables, stale) if stale else None
+    char_values = np.vstack([fresh.loc[c].to_numpy() if c in stale else previous[h]
+                             for c, h in zip(character_ids, data_hashes)])
+
+    # Pair blocks, computed in parallel when their contents changed
+    blocks_dir = feature_dir / "blocks"
+    blocks_dir.mkdir(parents=True, exist_ok=True)
+    value_hashes = [feature_hash(row) for row in char_values]
+    starts = list(range(0, len(character_ids), BLOCK_SIZE))
+    blocks = []
+    jobs = []
+    for row_start in starts:
+        rows = slice(row_start, row_start + BLOCK_SIZE)
+        for col_start in starts:
+            cols = slice(col_start, col_start + BLOCK_SIZE)
+            key = block_key(value_hashes[rows], value_hashes[cols])
+            block_file = blocks_dir / f"{key}.npy"
+            blocks.append({"row_start": row_start, "col_start": col_start, "file": f"blocks/{key}.npy"})
+            if not block_file.exists():
+                jobs.append((char_values[rows], char_values[cols], str(block_file)))
+
+    print(f"Computing {len(jobs)} of {len(blocks)} pair blocks...")
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for _ in pool.map(compute_pair_block, *zip(*jobs)):
+                pass
+
+    # Build sequence number, so the latest build can be found without comparing version strings
+    sequence = max((m.get("sequence", 0) for _, m in load_manifests(feature_dir)), default=0) + 1
+
+    version_dir = feature_dir / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+    np.save(version_dir / "characters.npy", char_values)
+    manifest = {
+        "version": version,
+        "sequence": sequence,
+        "feature_set_version": FEATURE_SET_VERSION,
+        "character_ids": character_ids,
+        "data_hashes": data_hashes,
+        "character_features": feature_names,
+        "pair_features": [name for name, _ in PAIR_FEATURES],
+        "block_size": BLOCK_SIZE,
+        "blocks": blocks
+    }
+    with open(version_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Saved feature store version '{version}' to {version_dir}")
+    return FeatureStore(feature_dir, version)
+
+class FeatureStore:
+    """
+    Read-only view of one feature store version. Pair blocks are memory-mapped,
+    so only the blocks a training loop touches are paged in. With version=None the
+    most recently built version is opened.
+    """
+
+    def __init__(self, feature_dir=FEATURE_DIR, version=None):
+        self.feature_dir = Path(feature_dir)
+        if version is None:
+            manifests = load_manifests(self.feature_dir)
+            if not manifests:
+                raise FileNotFoundError(f"No feature store versions found in {self.feature_dir}")
+            version = max(manifests, key=lambda m: m[1].get("sequence", 0))[0].name
+        self.version = version
+        with open(self.feature_dir / version / "manifest.json", "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.character_ids = self.manifest["character_ids"]
+        self.pair_feature_names = self.manifest["pair_features"]
+        self._positions = {c: i for i, c in enumerate(self.character_ids)}
+        self._blocks = {}
+
+    def character_features(self):
+        """
+        Return the character features as a DataFrame indexed by character_id.
+        """
+        values = np.load(self.feature_dir / self.version / "characters.npy", mmap_mode="r")
+        return pd.DataFrame(np.asarray(values), index=pd.Index(self.character_ids, name="character_id"),
+                            columns=self.manifest["character_features"])
+
+    def block(self, row_start, col_start):
+        """
+        Memory-map the pair block whose top-left corner is (row_start, col_start).
+        """
+        key = (row_start, col_start)
+        if key not in self._blocks:
+            entry = next(b for b in self.manifest["blocks"]
+                         if b["row_start"] == row_start and b["col_start"] == col_start)
+            self._blocks[key] = np.load(self.feature_dir / entry["file"], mmap_mode="r")
+        return self._blocks[key]
+
+    def pair(self, player_id, opponent_id):
+        """
+        Return the pair feature vector for one matchup.
+        """
+        size = self.manifest["block_size"]
+        i, j = self._positions[player_id], self._positions[opponent_id]
+        block = self.block(i - i % size, j - j % size)
+        return pd.Series(np.asarray(block[i % size, j % size]), index=self.pair_feature_names)
+
+    def iter_blocks(self):
+        """
+        Yield (player_ids, opponent_ids, memory-mapped block) for every pair block.
+        """
+        size = self.manifest["block_size"]
+        for entry in self.manifest["blocks"]:
+            rows = self.character_ids[entry["row_start"]:entry["row_start"] + size]
+            cols = self.character_ids[entry["col_start"]:entry["col_start"] + size]
+            yield rows, cols, self.block(entry["row_start"], entry["col_start"])
+
+if __name__ == "__main__":
+    store = build_feature_store(version=sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"{len(store.character_ids)} characters, {len(store.pair_feature_names)} pair features")
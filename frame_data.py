@@ -0,0 +1,154 @@
+import ast
+import hashlib
+import json
+from pathlib import Path
+import pandas as pd
+
+# Default location of the exported CSV tables
+DATA_DIR = Path.home() / "Documents" / "GitHub" / "SakurAI" / "data"
+
+# Shared hitbox parameter table referenced by hitboxes.param_id
+HITBOX_PARAMS_TABLE = "hitbox_params"
+
+AERIAL_NAMES = ["Neutral Air", "Forward Air", "Back Air", "Up Air", "Down Air"]
+
+def parse_frame_list(value):
+    """
+    Parse a frame list column (e.g. "[13]" or "[6, 7, 8]") into a list of ints.
+    Returns an empty list for missing or unparseable values.
+    """
+    if isinstance(value, list):
+        return [int(v) for v in value]
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = ast.literal_eval(str(value))
+        except (ValueError, SyntaxError):
+            return []
+    if isinstance(parsed, (int, float)):
+        return [int(parsed)]
+    if isinstance(parsed, (list, tuple)):
+        frames = []
+        for v in parsed:
+            try:
+                frames.append(int(v))
+            except (TypeError, ValueError):
+                continue
+        return frames
+    return []
+
+def classify_move(name):
+    """
+    Classify a move by its display name into a coarse move type:
+    jab, tilt, smash, aerial, dash, grab, throw, pummel, getup or special.
+    """
+    if not isinstance(name, str):
+        return "special"
+    lowered = name.lower()
+    if lowered.startswith("pummel"):
+        return "pummel"
+    if lowered in ("forward throw", "back throw", "up throw", "down throw"):
+        return "throw"
+    if lowered.endswith("grab") or lowered == "grab":
+        return "grab"
+    if lowered.startswith(("jab", "rapid jab")):
+        return "jab"
+    if lowered.startswith(("forward tilt", "up tilt", "down tilt")):
+        return "tilt"
+    if lowered.startswith(("forward smash", "up smash", "down smash")):
+        return "smash"
+    if lowered.startswith(("neutral air", "forward air", "back air", "up air", "down air", "zair")):
+        return "aerial"
+    if lowered.startswith("dash attack"):
+        return "dash"
+    if lowered.startswith(("getup attack", "ledge attack", "trip attack")):
+        return "getup"
+    return "special"
+
+def classify_ground_or_air(name, move_type=None):
+    """
+    Decide whether a move is performed on the ground or in the air.
+    """
+    if move_type is None:
+        move_type = classify_move(name)
+    if move_type == "aerial":
+        return "air"
+    if isinstance(name, str):
+        lowered = name.lower()
+        if "(aerial)" in lowered or "(air)" in lowered or lowered.startswith("air "):
+            return "air"
+    return "ground"
+
+def is_interned(data_dir=DATA_DIR):
+    """
+    Check whether hitboxes.csv references a separate hitbox_params.csv.
+    """
+    hitboxes_file = Path(data_dir) / "hitboxes.csv"
+    params_file = Path(data_dir) / f"{HITBOX_PARAMS_TABLE}.csv"
+    if not hitboxes_file.exists() or not params_file.exists():
+        return False
+    return "param_id" in pd.read_csv(hitboxes_file, nrows=0).columns
+
+def load_table(table_name, data_dir=DATA_DIR, usecols=None, dtype=None):
+    """
+    Load one of the exported CSV tables. Returns None if the file is missing.
+    Interned hitboxes are re-expanded to the wide form with every parameter inline.
+    Pass dtype=str to read every value exactly as written in the CSV.
+    """
+    csv_file = Path(data_dir) / f"{table_name}.csv"
+    if not csv_file.exists():
+        print(f"Warning: Table '{csv_file}' not found.")
+        return None
+    if table_name == "hitboxes" and is_interned(data_dir):
+        return load_wide_hitboxes(data_dir, usecols, dtype)
+    if usecols is not None:
+        header = pd.read_csv(csv_file, nrows=0).columns
+        usecols = [col for col in usecols if col in header]
+    return pd.read_csv(csv_file, usecols=usecols, dtype=dtype)
+
+def load_wide_hitboxes(data_dir=DATA_DIR, usecols=None, dtype=None):
+    """
+    Join interned hitbox rows back to their parameters from hitbox_params.csv.
+    """
+    hitboxes_file = Path(data_dir) / "hitboxes.csv"
+    params_file = Path(data_dir) / f"{HITBOX_PARAMS_TABLE}.csv"
+    hitbox_columns = list(pd.read_csv(hitboxes_file, nrows=0).columns)
+    param_columns = list(pd.read_csv(params_file, nrows=0).columns)
+    if usecols is not None:
+        hitbox_columns = [c for c in hitbox_columns if c in usecols or c == "param_id"]
+        param_columns = [c for c in param_columns if c in usecols or c == "param_id"]
+    hitboxes = pd.read_csv(hitboxes_file, usecols=hitbox_columns, dtype=dtype)
+    params = pd.read_csv(params_file, usecols=param_columns, dtype=dtype)
+    wide = hitboxes.merge(params, on="param_id", how="left")
+    if usecols is not None and "param_id" not in usecols:
+        wide = wide.drop(columns=["param_id"])
+    return wide
+
+def character_hashes(df, key="character_id"):
+    """
+    Compute a content hash of each character's rows in a table, used to detect
+    which characters changed between two versions of the dataset.
+
+    The hash covers the rows as formatted by pandas, so pass a table loaded with
+    dtype=str (see table_hashes); otherwise one blank cell that turns an int column
+    into floats changes the hash of every character.
+    """
+    hashes = {}
+    if df is None or df.empty:
+        return hashes
+    for char_id, rows in df.groupby(key, sort=False):
+        payload = rows.to_csv(index=False).encode("utf-8")
+        hashes[char_id] = hashlib.sha1(payload).hexdigest()
+    return hashes
+
+def table_hashes(table_name, data_dir=DATA_DIR):
+    """
+    Per-character content hashes of a table, computed from its values as written
+    in the CSV. Returns an empty dict if the table is missing.
+    """
+    if not (Path(data_dir) / f"{table_name}.csv").exists():
+        return {}
+    return character_hashes(load_table(table_name, data_dir, dtype=str))
@@ -0,0 +1,135 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+# Only the standard library is used here so small tools can query the data without pandas
+DB_PATH = Path.home() / "Documents" / "GitHub" / "SakurAI" / "data" / "frame_data.db"
+
+# Connections kept open per pool
+DEFAULT_POOL_SIZE = 4
+
+# Named queries. sqlite3 caches the compiled statement for each SQL string per
+# connection, so reusing these constants skips re-parsing on every lookup.
+QUERIES = {
+    "character": "SELECT * FROM characters WHERE character_id = ?",
+    "character_by_game_name": "SELECT * FROM characters WHERE game_name = ?",
+    "characters": "SELECT character_id, name FROM characters ORDER BY character_id",
+    "moves": "SELECT * FROM moves WHERE character_id = ? ORDER BY move_index",
+    "move": "SELECT * FROM moves WHERE character_id = ? AND move_index = ?",
+    "move_by_value": "SELECT * FROM moves WHERE value = ?",
+    "moves_by_name": "SELECT * FROM moves WHERE name = ? ORDER BY character_id",
+    "moves_by_type": "SELECT * FROM moves WHERE move_type = ? ORDER BY startup",
+    "fastest_moves": "SELECT * FROM moves WHERE startup <= ? ORDER BY startup, character_id",
+    "fastest_moves_by_type": ("SELECT * FROM moves WHERE move_type = ? AND startup <= ? "
+                              "ORDER BY startup, character_id"),
+    "hitboxes": "SELECT * FROM hitboxes WHERE character_id = ? AND move_index = ? ORDER BY hitbox_index",
+    "hitboxes_wide": ("SELECT * FROM hitboxes_wide WHERE character_id = ? AND move_index = ? "
+                      "ORDER BY hitbox_index"),
+    "throws": "SELECT * FROM throws WHERE character_id = ? ORDER BY move_index, throw_index"
+}
+
+class ConnectionPool:
+    """
+    A fixed-size pool of read-only SQLite connections that can be shared between threads.
+    """
+
+    def __init__(self, db_path=DB_PATH, size=DEFAULT_POOL_SIZE):
+        db_path = Path(db_path)
+        if not db_path.exists():
+            raise FileNotFoundError(f"Database '{db_path}' not found; run sqlite_exporter.py first")
+        self.db_path = db_path
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True,
+                               check_same_thread=False, cached_statements=len(QUERIES) * 2)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+class FrameDB:
+    """
+    Lookups against the SQLite export. Every method returns plain dicts.
+
+    Example:
+        db = FrameDB()
+        db.move_by_value("MarioFThrow")
+        db.fastest_moves(5, move_type="aerial")
+    """
+
+    def __init__(self, db_path=DB_PATH, pool_size=DEFAULT_POOL_SIZE):
+        self.pool = ConnectionPool(db_path, pool_size)
+
+    def close(self):
+        self.pool.close()
+
+    def query(self, name, *params):
+        """
+        Run one of the named QUERIES and return all rows.
+        """
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(QUERIES[name], params)]
+
+    def query_one(self, name, *params):
+        """
+        Run one of the named QUERIES and return the first row, or None.
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute(QUERIES[name], params).fetchone()
+        return dict(row) if row is not None else None
+
+    def character(self, character_id):
+        return self.query_one("character", character_id)
+
+    def character_by_game_name(self, game_name):
+        """
+        Look up a character by its in-game name (e.g. "mario" or "pzenigame").
+        """
+        return self.query_one("character_by_game_name", game_name)
+
+    def characters(self):
+        return self.query("characters")
+
+    def moves(self, character_id):
+        return self.query("moves", character_id)
+
+    def move(self, character_id, move_index):
+        return self.query_one("move", character_id, move_index)
+
+    def move_by_value(self, value):
+        return self.query_one("move_by_value", value)
+
+    def moves_by_name(self, name):
+        return self.query("moves_by_name", name)
+
+    def fastest_moves(self, max_startup, move_type=None):
+        """
+        Moves whose first active frame is at most max_startup, fastest first.
+        """
+        if move_type is None:
+            return self.query("fastest_moves", max_startup)
+        return self.query("fastest_moves_by_type", move_type, max_startup)
+
+    def hitboxes(self, character_id, move_index, wide=True):
+        """
+        Hitboxes of one move; wide=True inlines the interned hitbox parameters.
+        """
+        return self.query("hitboxes_wide" if wide else "hitboxes", character_id, move_index)
+
+    def throws(self, character_id):
+        return self.query("throws", character_id)
@@ -0,0 +1,626 @@
+import csv
+import io
+import json
+import operator
+from abc import ABC, abstractmethod
+from pathlib import Path
+import pandas as pd
+
+from frame_data import DATA_DIR, HITBOX_PARAMS_TABLE, is_interned
+
+# Rows per batch yielded by the executor
+DEFAULT_BATCH_SIZE = 10000
+
+# Column the CSV tables are partitioned on (rows for a character are contiguous)
+PARTITION_COLUMN = "character_id"
+
+# Sidecar directory holding the byte-range index for each table
+PARTITION_INDEX_DIR = ".partitions"
+
+# ---------------------------------------------------------------------------
+# Expressions
+# ---------------------------------------------------------------------------
+
+class Expr(ABC):
+    """
+    Base class for row predicates. Combine with &, | and ~.
+    """
+
+    @abstractmethod
+    def columns(self):
+        """Set of column names the predicate reads."""
+
+    @abstractmethod
+    def evaluate(self, df):
+        """Boolean Series selecting the matching rows of df."""
+
+    @abstractmethod
+    def rename(self, mapping):
+        """Copy of the predicate with its columns renamed through mapping."""
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    def __invert__(self):
+        return Not(self)
+
+class Column:
+    """
+    Reference to a column, used to build predicates: col("damage") > 10.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _compare(self, op, value):
+        return Comparison(self.name, op, value)
+
+    def __eq__(self, value):
+        return self._compare("==", value)
+
+    def __ne__(self, value):
+        return self._compare("!=", value)
+
+    def __lt__(self, value):
+        return self._compare("<", value)
+
+    def __le__(self, value):
+        return self._compare("<=", value)
+
+    def __gt__(self, value):
+        return self._compare(">", value)
+
+    def __ge__(self, value):
+        return self._compare(">=", value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        return IsIn(self.name, values)
+
+    def isna(self):
+        return IsNull(self.name)
+
+    def notna(self):
+        return Not(IsNull(self.name))
+
+    def contains(self, text, case=False):
+        return Contains(self.name, text, case)
+
+def col(name):
+    """
+    Shorthand for Column(name).
+    """
+    return Column(name)
+
+COMPARISON_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge
+}
+
+class Comparison(Expr):
+    def __init__(self, column, op, value):
+        self.column = column
+        self.op = op
+        self.value = value
+
+    def columns(self):
+        return {self.column}
+
+    def evaluate(self, df):
+        series = df[self.column]
+        if isinstance(self.value, (int, float)) and not isinstance(self.value, bool):
+            series = pd.to_numeric(series, errors="coerce")
+        return COMPARISON_OPERATORS[self.op](series, self.value).fillna(False).astype(bool)
+
+    def rename(self, mapping):
+        return Comparison(mapping.get(self.column, self.column), self.op, self.value)
+
+    def __repr__(self):
+        return f"({self.column} {self.op} {self.value!r})"
+
+class IsIn(Expr):
+    def __init__(self, column, values):
+        self.column = column
+        self.values = list(values)
+
+    def columns(self):
+        return {self.column}
+
+    def evaluate(self, df):
+        return df[self.column].isin(self.values)
+
+    def rename(self, mapping):
+        return IsIn(mapping.get(self.column, self.column), self.values)
+
+    def __repr__(self):
+        return f"({self.column} in {self.values!r})"
+
+class IsNull(Expr):
+    def __init__(self, column):
+        self.column = column
+
+    def columns(self):
+        return {self.column}
+
+    def evaluate(self, df):
+        return df[self.column].isna()
+
+    def rename(self, mapping):
+        return IsNull(mapping.get(self.column, self.column))
+
+    def __repr__(self):
+        return f"({self.column} is null)"
+
+class Contains(Expr):
+    def __init__(self, column, text, case=False):
+        self.column = column
+        self.text = text
+        self.case = case
+
+    def columns(self):
+        return {self.column}
+
+    def evaluate(self, df):
+        return df[self.column].astype("string").str.contains(
+            self.text, case=self.case, regex=False).fillna(False).astype(bool)
+
+    def rename(self, mapping):
+        return Contains(mapping.get(self.column, self.column), self.text, self.case)
+
+    def __repr__(self):
+        return f"({self.column} contains {self.text!r})"
+
+class And(Expr):
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def columns(self):
+        return self.left.columns() | self.right.columns()
+
+    def evaluate(self, df):
+        return self.left.evaluate(df) & self.right.evaluate(df)
+
+    def rename(self, mapping):
+        return And(self.left.rename(mapping), self.right.rename(mapping))
+
+    def __repr__(self):
+        return f"({self.left!r} & {self.right!r})"
+
+class Or(Expr):
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def columns(self):
+        return self.left.columns() | self.right.columns()
+
+    def evaluate(self, df):
+        return self.left.evaluate(df) | self.right.evaluate(df)
+
+    def rename(self, mapping):
+        return Or(self.left.rename(mapping), self.right.rename(mapping))
+
+    def __repr__(self):
+        return f"({self.left!r} | {self.right!r})"
+
+class Not(Expr):
+    def __init__(self, inner):
+        self.inner = inner
+
+    def columns(self):
+        return self.inner.columns()
+
+    def evaluate(self, df):
+        return ~self.inner.evaluate(df)
+
+    def rename(self, mapping):
+        return Not(self.inner.rename(mapping))
+
+    def __repr__(self):
+        return f"~{self.inner!r}"
+
+def split_conjunction(predicate):
+    """
+    Split a predicate on its top-level ANDs so each part can be pushed down separately.
+    """
+    if isinstance(predicate, And):
+        return split_conjunction(predicate.left) + split_conjunction(predicate.right)
+    return [predicate]
+
+def partition_values(predicates):
+    """
+    Return the set of partition keys allowed by a list of conjunctive predicates,
+    or None if the predicates don't restrict the partition column.
+    """
+    allowed = None
+    for predicate in predicates:
+        if isinstance(predicate, Comparison) and predicate.column == PARTITION_COLUMN and predicate.op == "==":
+            values = {predicate.value}
+        elif isinstance(predicate, IsIn) and predicate.column == PARTITION_COLUMN:
+            values = set(predicate.values)
+        else:
+            continue
+        allowed = values if allowed is None else allowed & values
+    return allowed
+
+# ---------------------------------------------------------------------------
+# Partition index
+# ---------------------------------------------------------------------------
+
+def build_partition_index(csv_file):
+    """
+    Scan a CSV once and record the byte ranges holding each character's rows.
+    Quoted fields may span lines, so rows are split on quote parity rather than newlines.
+    """
+    csv_file = Path(csv_file)
+    partitions = {}
+    with open(csv_file, "rb") as f:
+        header = f.readline()
+        key_pos = next(csv.reader([header.decode("utf-8")])).index(PARTITION_COLUMN)
+        offset = f.tell()
+        row_start = offset
+        row_lines = []
+        in_quotes = False
+        for line in f:
+            row_lines.append(line)
+            offset += len(line)
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes:
+                continue
+            text = b"".join(row_lines).decode("utf-8")
+            row_lines = []
+            if text.strip():
+                key = next(csv.reader([text]))[key_pos]
+                ranges = partitions.setdefault(key, [])
+                if ranges and ranges[-1][1] == row_start:
+                    ranges[-1][1] = offset
+                else:
+                    ranges.append([row_start, offset])
+            row_start = offset
+    return {"header_end": len(header), "partitions": partitions}
+
+def load_partition_index(csv_file):
+    """
+    Load the partition index for a CSV, rebuilding it if the CSV changed since it was written.
+    """
+    csv_file = Path(csv_file)
+    stat = csv_file.stat()
+    index_file = csv_file.parent / PARTITION_INDEX_DIR / f"{csv_file.stem}.json"
+    if index_file.exists():
+        try:
+            with open(index_file, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("size") == stat.st_size and index.get("mtime_ns") == stat.st_mtime_ns:
+                return index
+        except (OSError, ValueError):
+            pass
+
+    index = build_partition_index(csv_file)
+    index["size"] = stat.st_size
+    index["mtime_ns"] = stat.st_mtime_ns
+    try:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(index_file, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+    except OSError as e:
+        print(f"Warning: Could not save partition index {index_file}: {e}")
+    return index
+
+# ---------------------------------------------------------------------------
+# Logical plan
+# ---------------------------------------------------------------------------
+
+class Scan:
+    def __init__(self, table, data_dir):
+        self.table = table
+        self.csv_file = Path(data_dir) / f"{table}.csv"
+        if not self.csv_file.exists():
+            raise FileNotFoundError(f"Table '{self.csv_file}' not found")
+        self._schema = list(pd.read_csv(self.csv_file, nrows=0).columns)
+
+    def schema(self):
+        return list(self._schema)
+
+class Filter:
+    def __init__(self, child, predicate):
+        self.child = child
+        self.predicate = predicate
+
+    def schema(self):
+        return self.child.schema()
+
+class Project:
+    def __init__(self, child, columns):
+        missing = [c for c in columns if c not in child.schema()]
+        if missing:
+            raise KeyError(f"Unknown columns: {missing}")
+        self.child = child
+        self.columns = list(columns)
+
+    def schema(self):
+        return list(self.columns)
+
+class Join:
+    def __init__(self, left, right, on, how="inner", suffix="_right"):
+        if how not in ("inner", "left"):
+            raise ValueError("Only inner and left joins are supported")
+        self.left = left
+        self.right = right
+        self.on = [on] if isinstance(on, str) else list(on)
+        self.how = how
+        self.suffix = suffix
+        for key in self.on:
+            if key not in left.schema() or key not in right.schema():
+                raise KeyError(f"Join key '{key}' must exist on both sides")
+
+    def right_output_names(self):
+        """
+        Map each right-side column to its name in the join output.
+        """
+        left_columns = set(self.left.schema())
+        names = {}
+        for column in self.right.schema():
+            if column in self.on:
+                continue
+            names[column] = column + self.suffix if column in left_columns else column
+        return names
+
+    def schema(self):
+        return self.left.schema() + list(self.right_output_names().values())
+
+# ---------------------------------------------------------------------------
+# Physical plan
+# ---------------------------------------------------------------------------
+
+class ScanExec:
+    def __init__(self, scan, columns, predicates):
+        self.scan = scan
+        self.columns = [c for c in scan.schema() if c in columns]
+        self.predicates = predicates
+        self.partitions = partition_values(predicates)
+
+    def describe(self, depth=0):
+        pad = "  " * depth
+        parts = "all" if self.partitions is None else sorted(self.partitions)
+        return (f"{pad}Scan {self.scan.table} columns={self.columns} "
+                f"partitions={parts} filters={self.predicates}")
+
+    def _read(self, source, batch_size):
+        reader = pd.read_csv(source, usecols=self.columns, chunksize=batch_size)
+        for chunk in reader:
+            for predicate in self.predicates:
+                chunk = chunk[predicate.evaluate(chunk)]
+            if len(chunk):
+                yield chunk
+
+    def batches(self, batch_size):
+        if self.partitions is None:
+            yield from self._read(self.scan.csv_file, batch_size)
+            return
+
+        index = load_partition_index(self.scan.csv_file)
+        ranges = []
+        for key in self.partitions:
+            ranges.extend(index["partitions"].get(str(key), []))
+        if not ranges:
+            return
+        with open(self.scan.csv_file, "rb") as f:
+            header = f.read(index["header_end"])
+            for start, end in sorted(ranges):
+                f.seek(start)
+                source = io.BytesIO(header + f.read(end - start))
+                yield from self._read(source, batch_size)
+
+class FilterExec:
+    def __init__(self, child, predicates):
+        self.child = child
+        self.predicates = predicates
+
+    def describe(self, depth=0):
+        return f"{'  ' * depth}Filter {self.predicates}\n" + self.child.describe(depth + 1)
+
+    def batches(self, batch_size):
+        for batch in self.child.batches(batch_size):
+            for predicate in self.predicates:
+                batch = batch[predicate.evaluate(batch)]
+            if len(batch):
+                yield batch
+
+class ProjectExec:
+    def __init__(self, child, columns):
+        self.child = child
+        self.columns = columns
+
+    def describe(self, depth=0):
+        return f"{'  ' * depth}Project {self.columns}\n" + self.child.describe(depth + 1)
+
+    def batches(self, batch_size):
+        for batch in self.child.batches(batch_size):
+            yield batch[self.columns]
+
+class HashJoinExec:
+    """
+    Materialize the (already filtered and projected) right side, then stream the
+    left side through it batch by batch.
+    """
+
+    def __init__(self, left, right, on, how, right_names):
+        self.left = left
+        self.right = right
+        self.on = on
+        self.how = how
+        self.right_names = right_names
+
+    def describe(self, depth=0):
+        pad = "  " * depth
+        return (f"{pad}HashJoin {self.how} on={self.on}\n" +
+                self.left.describe(depth + 1) + "\n" + self.right.describe(depth + 1))
+
+    def batches(self, batch_size):
+        right_batches = list(self.right.batches(batch_size))
+        if not right_batches and self.how == "inner":
+            return
+        if right_batches:
+            build = pd.concat(right_batches, ignore_index=True)
+        else:
+            build = pd.DataFrame(columns=self.on + list(self.right_names))
+        build = build.rename(columns=self.right_names)
+        for batch in self.left.batches(batch_size):
+            joined = batch.merge(build, on=self.on, how=self.how)
+            if len(joined):
+                yield joined
+
+def plan(node, required=None, predicates=None):
+    """
+    Turn a logical plan into a physical one, pushing predicates and column
+    requirements as far down as possible.
+
+    Args:
+        node: Logical plan node
+        required (set): Columns needed above this node (None means all)
+        predicates (list): Conjunctive predicates to apply at or below this node
+    """
+    predicates = list(predicates or [])
+    schema = node.schema()
+    if required is None:
+        required = set(schema)
+
+    if isinstance(node, Filter):
+        return plan(node.child, required, predicates + split_conjunction(node.predicate))
+
+    if isinstance(node, Project):
+        physical = plan(node.child, required & set(node.columns), predicates)
+        output = [c for c in node.columns if c in required]
+        # Don't stack a second projection over one that already selects these columns
+        if isinstance(physical, ProjectExec) and set(physical.columns) == set(output):
+            physical = physical.child
+        if isinstance(physical, (ScanExec, ProjectExec)) and physical.columns == output:
+            return physical
+        return ProjectExec(physical, output)
+
+    if isinstance(node, Scan):
+        needed = set(required)
+        for predicate in predicates:
+            needed |= predicate.columns()
+        physical = ScanExec(node, needed, predicates)
+        output = [c for c in schema if c in required]
+        if output != physical.columns:
+            physical = ProjectExec(physical, output)
+        return physical
+
+    if isinstance(node, Join):
+        left_columns = set(node.left.schema())
+        right_names = node.right_output_names()
+        right_inputs = {out: inp for inp, out in right_names.items()}
+        keys = set(node.on)
+
+        left_preds, right_preds, residual = [], [], []
+        for predicate in predicates:
+            columns = predicate.columns()
+            if columns <= keys:
+                left_preds.append(predicate)
+                right_preds.append(predicate)
+            elif columns <= left_columns:
+                left_preds.append(predicate)
+            elif columns <= set(right_inputs) | keys and node.how == "inner":
+                right_preds.append(predicate.rename(right_inputs))
+            else:
+                residual.append(predicate)
+
+        needed = set(required)
+        for predicate in residual:
+            needed |= predicate.columns()
+        left_required = (needed & left_columns) | keys
+        right_required = {right_inputs[c] for c in needed if c in right_inputs} | keys
+
+        left = plan(node.left, left_required, left_preds)
+        right = plan(node.right, right_required, right_preds)
+        used_right_names = {inp: out for inp, out in right_names.items() if inp in right_required}
+        physical = HashJoinExec(left, right, node.on, node.how, used_right_names)
+        if residual:
+            physical = FilterExec(physical, residual)
+        output = [c for c in schema if c in required]
+        return ProjectExec(physical, output)
+
+    raise TypeError(f"Unknown plan node: {node!r}")
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+class LazyFrame:
+    """
+    A query over the frame-data tables that is only executed when collected.
+
+    Example:
+        hits = (scan("hitboxes")
+                .join(scan("moves"), on=["character_id", "move_index"])
+                .join(scan("characters").select(["character_id", "name"]),
+                      on="character_id")
+                .filter(col("character_id") == "01_mario")
+                .select(["name_right", "move_name", "damage"]))
+        for batch in hits.iter_batches():
+            ...
+    """
+
+    def __init__(self, node):
+        self.node = node
+
+    @property
+    def columns(self):
+        return self.node.schema()
+
+    def filter(self, predicate):
+        missing = sorted(predicate.columns() - set(self.columns))
+        if missing:
+            raise KeyError(f"Unknown columns: {missing}")
+        return LazyFrame(Filter(self.node, predicate))
+
+    def select(self, columns):
+        return LazyFrame(Project(self.node, columns))
+
+    def join(self, other, on, how="inner", suffix="_right"):
+        return LazyFrame(Join(self.node, other.node, on, how, suffix))
+
+    def explain(self):
+        """
+        Return the optimized physical plan as text.
+        """
+        return plan(self.node).describe()
+
+    def iter_batches(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Execute the query and yield the result as DataFrame batches.
+        """
+        for batch in plan(self.node).batches(batch_size):
+            yield batch.reset_index(drop=True)
+
+    def collect(self, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Execute the query and return the full result as one DataFrame.
+        """
+        batches = list(self.iter_batches(batch_size))
+        if not batches:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(batches, ignore_index=True)
+
+def scan(table, data_dir=DATA_DIR):
+    """
+    Start a lazy query over one of the tables (characters, moves, hitboxes, throws).
+    Interned hitboxes are presented in the wide form by joining hitbox_params on param_id;
+    the join is planned like any other, so unused parameter columns are never read.
+    """
+    if table == "hitboxes" and is_interned(data_dir):
+        return LazyFrame(Join(Scan(table, data_dir), Scan(HITBOX_PARAMS_TABLE, data_dir),
+                              on="param_id"))
+    return LazyFrame(Scan(table, data_dir))
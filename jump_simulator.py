@@ -0,0 +1,194 @@
+import sys
+import numpy as np
+import pandas as pd
+
+from frame_data import DATA_DIR, AERIAL_NAMES, load_table, parse_frame_list
+from frame_query import scan, col
+
+# Jump types simulated for every character: (name, height parameter, fast fall)
+JUMP_TYPES = [
+    ("short_hop", "param_HopHeight", False),
+    ("short_hop_ff", "param_HopHeight", True),
+    ("full_hop", "param_JumpHeight", False),
+    ("full_hop_ff", "param_JumpHeight", True),
+    ("double_jump", "param_AirJumpHeight", False),
+    ("double_jump_ff", "param_AirJumpHeight", True)
+]
+
+PHYSICS_COLUMNS = ["param_Jumpsquat", "param_HopHeight", "param_JumpHeight", "param_AirJumpHeight",
+                   "param_Gravity", "param_FallSpeed", "param_FastFallSpeed", "param_AirSpeed",
+                   "param_AerialBaseAcceleration", "param_AerialAddAcceleration"]
+
+LANDING_LAG_COLUMNS = {
+    "Neutral Air": "param_NairLandingLag",
+    "Forward Air": "param_FairLandingLag",
+    "Back Air": "param_BairLandingLag",
+    "Up Air": "param_UairLandingLag",
+    "Down Air": "param_DairLandingLag"
+}
+
+# Upper bound on simulated airborne frames
+MAX_FRAMES = 300
+
+def initial_jump_speed(height, gravity):
+    """
+    Vertical launch speed whose frame-by-frame arc peaks at the given height.
+    With y += v; v -= g per frame the apex is v0^2 / 2g + v0 / 2, solved here for v0.
+    """
+    return -gravity / 2 + np.sqrt(gravity ** 2 / 4 + 2 * gravity * height)
+
+def simulate_jumps(characters_df, max_frames=MAX_FRAMES):
+    """
+    Integrate every character x jump type arc in one batched array computation.
+
+    Each frame: position += velocity, then vertical velocity -= gravity down to
+    -FallSpeed (or straight to -FastFallSpeed from the first frame after the apex when
+    fast falling). Horizontal velocity grows by the aerial base + add acceleration up
+    to AirSpeed, i.e. the character holds full drift from a standing jump. Heights are
+    relative to where the jump started, so double jumps are measured on their own arc.
+
+    Returns:
+        tuple: (summary DataFrame with one row per character and jump type,
+                heights array of shape (characters, jump types, frames))
+    """
+    missing = [c for c in PHYSICS_COLUMNS if c not in characters_df.columns]
+    if missing:
+        raise KeyError(f"characters table is missing physics columns: {missing}")
+
+    params = characters_df[PHYSICS_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    param = {name: params[:, i][:, None] for i, name in enumerate(PHYSICS_COLUMNS)}
+
+    heights = np.stack([param[height_col][:, 0] for _, height_col, _ in JUMP_TYPES], axis=1)
+    fast_fall = np.array([ff for _, _, ff in JUMP_TYPES])[None, :]
+    shape = heights.shape
+
+    gravity = np.broadcast_to(param["param_Gravity"], shape)
+    fall_speed = np.where(fast_fall, param["param_FastFallSpeed"], param["param_FallSpeed"])
+    acceleration = np.broadcast_to(param["param_AerialBaseAcceleration"] + param["param_AerialAddAcceleration"], shape)
+    air_speed = np.broadcast_to(param["param_AirSpeed"], shape)
+
+    vy = initial_jump_speed(heights, gravity)
+    vx = np.zeros(shape)
+    y = np.zeros(shape)
+    x = np.zeros(shape)
+    valid = np.isfinite(vy) & (vy > 0)
+    airborne = valid.copy()
+    airtime = np.zeros(shape, dtype=int)
+    apex_frame = np.zeros(shape, dtype=int)
+    apex_height = np.zeros(shape)
+    trajectory = np.full(shape + (max_frames,), np.nan)
+
+    for frame in range(1, max_frames + 1):
+        if not airborne.any():
+            break
+        y = np.where(airborne, y + vy, y)
+        x = np.where(airborne, x + vx, x)
+        rising = airborne & (y > apex_height)
+        apex_height = np.where(rising, y, apex_height)
+        apex_frame = np.where(rising, frame, apex_frame)
+
+        landed = airborne & (y <= 0)
+        airtime = np.where(landed, frame, airtime)
+        y = np.where(landed, 0.0, y)
+        trajectory[..., frame - 1] = np.where(airborne, y, np.nan)
+        airborne &= ~landed
+
+        falling = vy - gravity <= 0
+        vy = np.where(fast_fall & falling, -fall_speed, np.maximum(vy - gravity, -fall_speed))
+        vx = np.minimum(vx + acceleration, air_speed)
+
+    jumpsquat = np.broadcast_to(param["param_Jumpsquat"], shape)
+    summary = pd.DataFrame({
+        "character_id": np.repeat(characters_df["character_id"].to_numpy(), len(JUMP_TYPES)),
+        "name": np.repeat(characters_df["name"].to_numpy(), len(JUMP_TYPES)),
+        "jump_type": np.tile([name for name, _, _ in JUMP_TYPES], len(characters_df)),
+        "jumpsquat": jumpsquat.ravel(),
+        "airtime": np.where(valid & ~airborne, airtime, np.nan).ravel(),
+        "apex_frame": np.where(valid, apex_frame, np.nan).ravel(),
+        "apex_height": np.where(valid, apex_height, np.nan).ravel(),
+        "drift_distance": np.where(valid, x, np.nan).ravel()
+    })
+    summary["total_frames"] = summary["jumpsquat"] + summary["airtime"]
+    return summary, trajectory
+
+def load_aerial_windows(data_dir=DATA_DIR):
+    """
+    Active frames, FAF and landing lag for every character's five aerials.
+    Active frames come from hitboxes.csv when it is available.
+    """
+    moves = (scan("moves", data_dir)
+             .filter(col("name").isin(AERIAL_NAMES))
+             .select(["character_id", "move_index", "name", "faf"])
+             .collect())
+    moves["faf"] = pd.to_numeric(moves["faf"], errors="coerce")
+
+    try:
+        hitboxes = (scan("hitboxes", data_dir)
+                    .join(scan("moves", data_dir).select(["character_id", "move_index", "name"]),
+                          on=["character_id", "move_index"])
+                    .filter(col("name").isin(AERIAL_NAMES))
+                    .select(["character_id", "move_index", "frames"])
+                    .collect())
+    except FileNotFoundError:
+        print("Warning: hitboxes.csv not found; aerial active frames will be missing.")
+        hitboxes = pd.DataFrame(columns=["character_id", "move_index", "frames"])
+
+    frames = hitboxes["frames"].apply(parse_frame_list)
+    hitboxes = hitboxes.assign(
+        first_active=frames.apply(lambda f: min(f) if f else np.nan),
+        last_active=frames.apply(lambda f: max(f) if f else np.nan))
+    active = hitboxes.groupby(["character_id", "move_index"]).agg(
+        first_active=("first_active", "min"), last_active=("last_active", "max")).reset_index()
+    windows = moves.merge(active, on=["character_id", "move_index"], how="left")
+
+    lag_columns = list(LANDING_LAG_COLUMNS.values())
+    characters = scan("characters", data_dir).select(["character_id"] + lag_columns).collect()
+    lag = characters.melt(id_vars="character_id", value_vars=lag_columns,
+                          var_name="lag_column", value_name="landing_lag")
+    lag["name"] = lag["lag_column"].map({v: k for k, v in LANDING_LAG_COLUMNS.items()})
+    windows = windows.merge(lag[["character_id", "name", "landing_lag"]], on=["character_id", "name"], how="left")
+    return windows.drop_duplicates(["character_id", "name"])
+
+def overlay_aerials(summary, windows, jump_type="short_hop", input_frame=1):
+    """
+    Overlay aerial windows on one jump type's arc.
+
+    An aerial input on airborne frame input_frame lands without landing lag when its
+    FAF is reached before touching the ground ("auto-cancelled" in the simple sense the
+    dataset supports, since autocancel windows aren't extracted).
+
+    Returns:
+        pandas.DataFrame: One row per character and aerial with the overlay columns
+    """
+    arcs = summary[summary["jump_type"] == jump_type][["character_id", "airtime", "apex_frame"]]
+    overlay = windows.merge(arcs, on="character_id", how="inner")
+    offset = input_frame - 1
+    overlay["hits_before_landing"] = overlay["first_active"] + offset <= overlay["airtime"]
+    overlay["fully_active_before_landing"] = overlay["last_active"] + offset <= overlay["airtime"]
+    overlay["lands_lag_free"] = overlay["faf"] + offset <= overlay["airtime"]
+    overlay["landing_lag_taken"] = np.where(overlay["lands_lag_free"], 0, overlay["landing_lag"])
+    # Latest airborne input frame that still reaches FAF before landing
+    overlay["latest_lag_free_input"] = (overlay["airtime"] - overlay["faf"] + 1).where(
+        overlay["airtime"] >= overlay["faf"])
+    return overlay
+
+def run_simulation(data_dir=DATA_DIR):
+    """
+    Simulate every character's jumps and print the short hop aerial overlay.
+    """
+    characters_df = load_table("characters", data_dir, usecols=["character_id", "name"] + PHYSICS_COLUMNS)
+    if characters_df is None:
+        sys.exit(1)
+    summary, _ = simulate_jumps(characters_df)
+    print("\nShort hop / full hop airtime:")
+    airtime = summary.pivot(index="name", columns="jump_type", values="airtime")
+    print(airtime[["short_hop", "short_hop_ff", "full_hop", "full_hop_ff"]].head(10).to_string())
+
+    overlay = overlay_aerials(summary, load_aerial_windows(data_dir), "short_hop")
+    lag_free = overlay[overlay["lands_lag_free"]]
+    print(f"\n{len(lag_free)} aerials land lag-free out of a short hop, e.g.:")
+    print(lag_free[["character_id", "name", "faf", "airtime"]].head(10).to_string(index=False))
+    return summary, overlay
+
+if __name__ == "__main__":
+    run_simulation()
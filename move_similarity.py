@@ -0,0 +1,299 @@
+import sys
+import hashlib
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from frame_data import (DATA_DIR, load_table, parse_frame_list, classify_move,
+                        classify_ground_or_air, table_hashes)
+
+# Numeric columns that make up a move's embedding
+FEATURE_COLUMNS = ["damage", "angle_x", "angle_y", "bkb", "kbg", "startup", "active_frames", "faf"]
+
+KEY_COLUMNS = ["character_id", "move_index", "name", "value", "move_type", "ground_or_air", "target_situation"]
+
+INDEX_FILE_NAME = "move_similarity.npz"
+
+# The Sakurai angle (361) launches at roughly 40 degrees on grounded opponents
+SAKURAI_ANGLE = 361
+SAKURAI_ANGLE_DEGREES = 40.0
+
+def summarize_hit_rows(df):
+    """
+    Reduce hitbox or throw rows to one row per move: the strongest hit's
+    damage/angle/knockback, the first active frame and the number of active frames.
+
+    target_situation is "air" or "ground" when every hitbox's collision mask only hits
+    opponents in that situation. It says nothing about where the attacker performs the move.
+    """
+    columns = ["character_id", "move_index", "damage", "angle", "bkb", "kbg",
+               "startup", "active_frames", "target_situation"]
+    if df is None or df.empty:
+        return pd.DataFrame(columns=columns)
+
+    df = df.copy()
+    for col in ["damage", "angle", "bkb", "kbg"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else np.nan
+    frame_lists = df["frames"].apply(parse_frame_list) if "frames" in df.columns else pd.Series([[]] * len(df), index=df.index)
+    df["first_frame"] = frame_lists.apply(lambda frames: min(frames) if frames else np.nan)
+    df["frame_set"] = frame_lists.apply(set)
+    if "ground_or_air" not in df.columns:
+        df["ground_or_air"] = None
+
+    rows = []
+    for (char_id, move_idx), group in df.groupby(["character_id", "move_index"], sort=False):
+        strongest = group.loc[group["damage"].fillna(-1).idxmax()]
+        active = set().union(*group["frame_set"])
+        masks = set(group["ground_or_air"].dropna().astype(str))
+        if masks and all(mask.endswith("_a") for mask in masks):
+            target_situation = "air"
+        elif masks and all(mask.endswith("_g") for mask in masks):
+            target_situation = "ground"
+        else:
+            target_situation = None
+        rows.append({
+            "character_id": char_id,
+            "move_index": move_idx,
+            "damage": strongest["damage"],
+            "angle": strongest["angle"],
+            "bkb": strongest["bkb"],
+            "kbg": strongest["kbg"],
+            "startup": group["first_frame"].min(),
+            "active_frames": len(active),
+            "target_situation": target_situation
+        })
+    return pd.DataFrame(rows, columns=columns)
+
+def build_move_table(moves_df, hitboxes_df=None, throws_df=None):
+    """
+    Build one row per move with its identifying keys and raw (unnormalized) features.
+    Hitbox data takes priority; throws fill in moves that have no hitboxes.
+    """
+    table = moves_df[["character_id", "move_index", "name", "value", "faf"]].copy()
+    table["faf"] = pd.to_numeric(table["faf"], errors="coerce")
+
+    hits = summarize_hit_rows(hitboxes_df)
+    throws = summarize_hit_rows(throws_df)
+    if not throws.empty:
+        hits = pd.concat([hits, throws], ignore_index=True)
+        hits = hits.drop_duplicates(["character_id", "move_index"], keep="first")
+    table = table.merge(hits, on=["character_id", "move_index"], how="left")
+
+    table["move_type"] = table["name"].apply(classify_move)
+    table["ground_or_air"] = [classify_ground_or_air(name, move_type)
+                              for name, move_type in zip(table["name"], table["move_type"])]
+    table["target_situation"] = table["target_situation"].fillna("")
+
+    angle = pd.to_numeric(table["angle"], errors="coerce")
+    angle = angle.where(angle != SAKURAI_ANGLE, SAKURAI_ANGLE_DEGREES) % 360
+    radians = np.deg2rad(angle)
+    table["angle_x"] = np.cos(radians)
+    table["angle_y"] = np.sin(radians)
+
+    for col in FEATURE_COLUMNS:
+        table[col] = pd.to_numeric(table[col], errors="coerce")
+    return table[KEY_COLUMNS + FEATURE_COLUMNS].reset_index(drop=True)
+
+def dataset_hashes(moves_df, data_dir=DATA_DIR):
+    """
+    Combine the per-table content hashes into one hash per character.
+    """
+    per_table = [table_hashes(name, data_dir) for name in ("moves", "hitboxes", "throws")]
+    combined = {}
+    for char_id in moves_df["character_id"].unique():
+        digest = hashlib.sha1()
+        for hashes in per_table:
+            digest.update(hashes.get(char_id, "").encode("utf-8"))
+        combined[char_id] = digest.hexdigest()
+    return combined
+
+class MoveSimilarityIndex:
+    """
+    Nearest-neighbor index over every move in the roster.
+
+    Each move is embedded as a z-score normalized vector of FEATURE_COLUMNS and
+    stored in a KD-tree. One tree is built per filter combination the first time
+    that combination is queried, so repeated lookups only pay for the tree query.
+    """
+
+    def __init__(self, move_table, hashes):
+        self.move_table = move_table.reset_index(drop=True)
+        self.hashes = dict(hashes)
+        raw = self.move_table[FEATURE_COLUMNS].to_numpy(dtype=float)
+        self.means = np.nanmean(raw, axis=0) if len(raw) else np.zeros(len(FEATURE_COLUMNS))
+        self.stds = np.nanstd(raw, axis=0) if len(raw) else np.ones(len(FEATURE_COLUMNS))
+        self.means = np.nan_to_num(self.means)
+        self.stds = np.where(np.nan_to_num(self.stds) > 0, np.nan_to_num(self.stds), 1.0)
+        # Missing features sit at the column mean, i.e. zero after normalizing
+        self.vectors = np.nan_to_num((raw - self.means) / self.stds)
+
+        self._records = self.move_table[KEY_COLUMNS].to_dict("records")
+        self._lookup = {}
+        for row, (char_id, name, value) in enumerate(zip(self.move_table["character_id"],
+                                                          self.move_table["name"],
+                                                          self.move_table["value"])):
+            self._lookup[(char_id, str(value).lower())] = row
+            self._lookup.setdefault((char_id, str(name).lower()), row)
+        self._trees = {}
+
+    def __len__(self):
+        return len(self.move_table)
+
+    def find_move(self, character_id, move):
+        """
+        Return the row number of a move, given its name (e.g. "Forward Throw"),
+        its value (e.g. "MarioFThrow") or its move_index.
+        """
+        if isinstance(move, (int, np.integer)):
+            matches = np.flatnonzero((self.move_table["character_id"] == character_id).to_numpy() &
+                                     (self.move_table["move_index"] == move).to_numpy())
+            if len(matches):
+                return int(matches[0])
+        else:
+            row = self._lookup.get((character_id, str(move).lower()))
+            if row is not None:
+                return row
+        raise KeyError(f"Move '{move}' not found for character '{character_id}'")
+
+    def _tree_for(self, move_type=None, ground_or_air=None):
+        key = (move_type, ground_or_air)
+        if key not in self._trees:
+            mask = np.ones(len(self.move_table), dtype=bool)
+            if move_type is not None:
+                mask &= (self.move_table["move_type"] == move_type).to_numpy()
+            if ground_or_air is not None:
+                mask &= (self.move_table["ground_or_air"] == ground_or_air).to_numpy()
+            rows = np.flatnonzero(mask)
+            tree = cKDTree(self.vectors[rows]) if len(rows) else None
+            self._trees[key] = (tree, rows)
+        return self._trees[key]
+
+    def query(self, character_id, move, k=10, move_type=None, ground_or_air=None):
+        """
+        Find the k moves most similar to the given move.
+
+        Args:
+            character_id (str): Character of the reference move, e.g. "01_mario"
+            move (str or int): Move name, value or move_index
+            k (int): Number of neighbors to return
+            move_type (str): Only return moves of this type (see classify_move)
+            ground_or_air (str): Only return "ground" or "air" moves
+
+        Returns:
+            list: Neighbor dicts sorted by distance, excluding the move itself
+        """
+        row = self.find_move(character_id, move)
+        return self.query_vector(self.vectors[row], k, move_type, ground_or_air, exclude_row=row)
+
+    def query_vector(self, vector, k=10, move_type=None, ground_or_air=None, exclude_row=None):
+        """
+        Find the k moves closest to an already normalized feature vector.
+        """
+        tree, rows = self._tree_for(move_type, ground_or_air)
+        if tree is None or k <= 0:
+            return []
+        n = min(k + (1 if exclude_row is not None else 0), len(rows))
+        distances, positions = tree.query(vector, k=n)
+        distances = np.atleast_1d(distances)
+        positions = np.atleast_1d(positions)
+
+        results = []
+        for distance, position in zip(distances, positions):
+            match = int(rows[position])
+            if match == exclude_row:
+                continue
+            results.append(dict(self._records[match], distance=float(distance)))
+            if len(results) == k:
+                break
+        return results
+
+    def save(self, index_path):
+        """
+        Persist the raw move features and character hashes. KD-trees are rebuilt
+        on load, which takes milliseconds for the full roster.
+        """
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        table = self.move_table
+        hash_ids = sorted(self.hashes)
+        with open(index_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                features=table[FEATURE_COLUMNS].to_numpy(dtype=float),
+                move_index=table["move_index"].to_numpy(dtype=np.int64),
+                **{col: table[col].fillna("").astype(str).to_numpy(dtype=str)
+                   for col in KEY_COLUMNS if col != "move_index"},
+                hash_ids=np.array(hash_ids, dtype=str),
+                hash_values=np.array([self.hashes[c] for c in hash_ids], dtype=str)
+            )
+
+    @classmethod
+    def load(cls, index_path):
+        """
+        Load an index written by save().
+        """
+        with np.load(index_path, allow_pickle=False) as data:
+            table = pd.DataFrame(data["features"], columns=FEATURE_COLUMNS)
+            for col in KEY_COLUMNS:
+                table[col] = data[col]
+            hashes = dict(zip(data["hash_ids"].tolist(), data["hash_values"].tolist()))
+        return cls(table[KEY_COLUMNS + FEATURE_COLUMNS], hashes)
+
+def build_index(data_dir=DATA_DIR, index_path=None):
+    """
+    Build (or incrementally refresh) the similarity index for the dataset in data_dir.
+
+    If an index already exists at index_path, only characters whose moves, hitboxes
+    or throws changed are re-embedded; every other character's features are reused.
+    """
+    data_dir = Path(data_dir)
+    index_path = Path(index_path) if index_path else data_dir / INDEX_FILE_NAME
+
+    moves_df = load_table("moves", data_dir)
+    if moves_df is None:
+        print("Error: moves.csv is required to build the similarity index.")
+        sys.exit(1)
+    hitboxes_df = load_table("hitboxes", data_dir)
+    throws_df = load_table("throws", data_dir)
+
+    hashes = dataset_hashes(moves_df, data_dir)
+
+    previous = None
+    if index_path.exists():
+        try:
+            previous = MoveSimilarityIndex.load(index_path)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Could not read existing index {index_path}: {e}")
+
+    if previous is not None:
+        changed = [c for c, h in hashes.items() if previous.hashes.get(c) != h]
+        reused = previous.move_table[previous.move_table["character_id"].isin(
+            [c for c in hashes if c not in changed])]
+    else:
+        changed = list(hashes)
+        reused = None
+
+    print(f"Embedding moves for {len(changed)} of {len(hashes)} characters...")
+
+    def only_changed(df):
+        if df is None:
+            return None
+        return df[df["character_id"].isin(changed)]
+
+    fresh = build_move_table(only_changed(moves_df), only_changed(hitboxes_df), only_changed(throws_df))
+    move_table = pd.concat([reused, fresh], ignore_index=True) if reused is not None else fresh
+    move_table = move_table.sort_values(["character_id", "move_index"], kind="stable")
+
+    index = MoveSimilarityIndex(move_table, hashes)
+    index.save(index_path)
+    print(f"Saved similarity index with {len(index)} moves to {index_path}")
+    return index
+
+if __name__ == "__main__":
+    index = build_index()
+    if len(sys.argv) >= 3:
+        character_id, move = sys.argv[1], sys.argv[2]
+        print(f"\nMoves most similar to {character_id} {move}:")
+        for match in index.query(character_id, move, k=10):
+            print(f"  {match['distance']:.3f}  {match['character_id']:<20} {match['name']}")
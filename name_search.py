@@ -0,0 +1,271 @@
+import re
+import sys
+import json
+from pathlib import Path
+import numpy as np
+
+from frame_data import DATA_DIR, load_table
+
+INDEX_FILE_NAME = "name_search.npz"
+
+# display_to_game_names.json written by character_attributes_extractor.py
+DISPLAY_TO_GAME_FILE = DATA_DIR.parent / "extracted_data" / "display_to_game_names.json"
+
+# Minimum similarity for resolve_character to accept a fuzzy match
+DEFAULT_MIN_SCORE = 0.5
+
+# How far a fuzzy match must score above the next best character, so a name is
+# never settled between two close candidates (e.g. "Link" vs "Toon Link")
+DEFAULT_MIN_MARGIN = 0.2
+
+# Words that don't distinguish characters ("Banjo & Kazooie" vs "Banjo and Kazooie")
+FILLER_WORDS = {"and", "the"}
+
+ENTRY_FIELDS = ["kind", "character_id", "move_index", "field", "text"]
+
+def normalize_text(text):
+    """
+    Lowercase text and split it into words, breaking camelCase and letter/digit
+    boundaries so "MarioJab1" and "Jab 1" share words.
+    """
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    text = re.sub(r"([A-Za-z])([0-9])|([0-9])([A-Za-z])", r"\1\3 \2\4", text)
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+def name_words(text):
+    """
+    Set of normalized words in a name, ignoring FILLER_WORDS.
+    """
+    return set(normalize_text(text).split()) - FILLER_WORDS
+
+def trigrams(text):
+    """
+    Set of word trigrams with each word padded as "  word ", so short words and
+    word starts still produce trigrams.
+    """
+    grams = set()
+    for word in normalize_text(text).split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def strip_number_prefix(character_id):
+    return character_id.split("_", 1)[1] if "_" in character_id else character_id
+
+def build_character_entries(characters_df, display_to_game=None):
+    """
+    Search entries for each character's display name, file stem and game name.
+    Game names come from the display_to_game mapping when given, otherwise from
+    the characters table's game_name column.
+    """
+    entries = []
+    by_display = {}
+    for char_id, name in zip(characters_df["character_id"], characters_df["name"]):
+        entries.append(("character", char_id, -1, "name", str(name)))
+        entries.append(("character", char_id, -1, "file_stem", strip_number_prefix(char_id)))
+        by_display[normalize_text(str(name))] = char_id
+
+    if display_to_game:
+        for display_name, game_name in display_to_game.items():
+            char_id = by_display.get(normalize_text(display_name))
+            if char_id is None:
+                continue
+            entries.append(("character", char_id, -1, "game_name", game_name))
+    elif "game_name" in characters_df.columns:
+        for char_id, game_name in zip(characters_df["character_id"], characters_df["game_name"]):
+            if isinstance(game_name, str):
+                entries.append(("character", char_id, -1, "game_name", game_name))
+    return entries
+
+def build_move_entries(moves_df):
+    """
+    Search entries for each move's name, value key and notes.
+    """
+    entries = []
+    for row in moves_df[["character_id", "move_index", "name", "value", "notes"]].itertuples(index=False):
+        for field in ("name", "value", "notes"):
+            text = getattr(row, field)
+            if isinstance(text, str) and text:
+                entries.append(("move", row.character_id, int(row.move_index), field, text))
+    return entries
+
+class NameSearchIndex:
+    """
+    Trigram index over character and move names.
+
+    Postings are stored in CSR form (one array of entry ids per trigram), so a query
+    is one np.bincount over the postings of its trigrams followed by a top-k selection.
+    Scores are the Jaccard similarity of the trigram sets.
+    """
+
+    def __init__(self, entries, vocabulary=None, indptr=None, postings=None):
+        self.entries = [tuple(entry) for entry in entries]
+        self.kinds = np.array([e[0] for e in self.entries], dtype=str)
+        self.character_ids = np.array([e[1] for e in self.entries], dtype=str)
+        if vocabulary is None:
+            vocabulary, indptr, postings = self._build_postings()
+        self.vocabulary = {gram: i for i, gram in enumerate(vocabulary)}
+        self.indptr = indptr
+        self.postings = postings
+        self.sizes = np.bincount(postings, minlength=len(self.entries))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _build_postings(self):
+        posting_lists = {}
+        for entry_id, entry in enumerate(self.entries):
+            for gram in trigrams(entry[4]):
+                posting_lists.setdefault(gram, []).append(entry_id)
+        vocabulary = sorted(posting_lists)
+        lengths = [len(posting_lists[gram]) for gram in vocabulary]
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        postings = np.array([i for gram in vocabulary for i in posting_lists[gram]], dtype=np.int32)
+        return vocabulary, indptr, postings
+
+    def search(self, query, k=10, kind=None, character_id=None, min_score=0.0):
+        """
+        Return up to k ranked matches for a free-text query.
+
+        Args:
+            query (str): Text to look up, e.g. "rob", "fthrow" or "Banjo and Kazooie"
+            k (int): Maximum number of results
+            kind (str): Restrict to "character" or "move" entries
+            character_id (str): Restrict to one character's entries
+            min_score (float): Drop matches below this similarity
+
+        Returns:
+            list: Result dicts (best field per character or move), best match first
+        """
+        query_grams = trigrams(query)
+        grams = [self.vocabulary[g] for g in query_grams if g in self.vocabulary]
+        query_size = len(query_grams)
+        if not grams:
+            return []
+        hits = np.concatenate([self.postings[self.indptr[g]:self.indptr[g + 1]] for g in grams])
+        shared = np.bincount(hits, minlength=len(self.entries))
+        scores = shared / (query_size + self.sizes - shared)
+        if kind is not None:
+            scores = np.where(self.kinds == kind, scores, 0.0)
+        if character_id is not None:
+            scores = np.where(self.character_ids == character_id, scores, 0.0)
+
+        candidates = np.flatnonzero(scores > max(min_score, 0.0))
+        # Entries repeat per field, so look past k to fill k distinct results
+        limit = min(len(candidates), k * 4)
+        if limit < len(candidates):
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = []
+        seen = set()
+        for entry_id in candidates:
+            entry_kind, char_id, move_index, field, text = self.entries[entry_id]
+            key = (entry_kind, char_id, move_index)
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append({
+                "kind": entry_kind,
+                "character_id": char_id,
+                "move_index": None if move_index < 0 else move_index,
+                "field": field,
+                "text": text,
+                "score": float(scores[entry_id])
+            })
+            if len(results) == k:
+                break
+        return results
+
+    def resolve_character(self, name, min_score=DEFAULT_MIN_SCORE, min_margin=DEFAULT_MIN_MARGIN,
+                          exclude=()):
+        """
+        Return the character_id best matching a name from any source, or None if
+        nothing is similar enough or the match is ambiguous.
+
+        The best character must score at least min_score and beat the runner-up by
+        min_margin. Unless one of its names has exactly the query's words, a character
+        with a name that adds whole words to the query, or drops some, is a sibling
+        rather than a spelling variant ("Dr. Mario" for "Mario", "Dark Samus" for
+        "Samus"), so it is rejected. Characters in exclude
+        (e.g. already matched exactly) are never returned; if one of them is the best
+        match, None is returned rather than the next best character.
+        """
+        matches = self.search(name, k=2, kind="character")
+        if not matches or matches[0]["character_id"] in exclude or matches[0]["score"] < min_score:
+            return None
+        runner_up = matches[1]["score"] if len(matches) > 1 else 0.0
+        if matches[0]["score"] - runner_up < min_margin:
+            return None
+
+        char_id = matches[0]["character_id"]
+        query = name_words(name)
+        entry_ids = np.flatnonzero((self.kinds == "character") & (self.character_ids == char_id))
+        names = [name_words(self.entries[entry_id][4]) for entry_id in entry_ids]
+        if query not in names and any(words < query or query < words for words in names):
+            return None
+        return char_id
+
+    def save(self, index_path):
+        """
+        Persist the entries and postings so the index loads without re-tokenizing.
+        """
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        columns = list(zip(*self.entries)) if self.entries else [[]] * len(ENTRY_FIELDS)
+        with open(index_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                vocabulary=np.array(vocabulary, dtype=str),
+                indptr=self.indptr,
+                postings=self.postings,
+                move_index=np.array(columns[2], dtype=np.int64),
+                **{field: np.array(columns[i], dtype=str)
+                   for i, field in enumerate(ENTRY_FIELDS) if field != "move_index"}
+            )
+
+    @classmethod
+    def load(cls, index_path):
+        """
+        Load an index written by save().
+        """
+        with np.load(index_path, allow_pickle=False) as data:
+            entries = list(zip(data["kind"].tolist(), data["character_id"].tolist(),
+                               data["move_index"].tolist(), data["field"].tolist(),
+                               data["text"].tolist()))
+            return cls(entries, data["vocabulary"].tolist(), data["indptr"], data["postings"])
+
+def load_display_to_game(display_to_game_file=DISPLAY_TO_GAME_FILE):
+    display_to_game_file = Path(display_to_game_file)
+    if not display_to_game_file.exists():
+        return None
+    with open(display_to_game_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def build_search_index(data_dir=DATA_DIR, index_path=None, display_to_game_file=DISPLAY_TO_GAME_FILE):
+    """
+    Build the character and move search index for the dataset and save it next to the CSVs.
+    """
+    data_dir = Path(data_dir)
+    index_path = Path(index_path) if index_path else data_dir / INDEX_FILE_NAME
+    characters_df = load_table("characters", data_dir, usecols=["character_id", "name", "game_name"])
+    moves_df = load_table("moves", data_dir, usecols=["character_id", "move_index", "name", "value", "notes"])
+    if characters_df is None or moves_df is None:
+        print("Error: characters.csv and moves.csv are required to build the search index.")
+        sys.exit(1)
+
+    entries = build_character_entries(characters_df, load_display_to_game(display_to_game_file))
+    entries += build_move_entries(moves_df)
+    index = NameSearchIndex(entries)
+    index.save(index_path)
+    print(f"Saved search index with {len(index)} entries to {index_path}")
+    return index
+
+if __name__ == "__main__":
+    index = build_search_index()
+    if len(sys.argv) > 1:
+        for match in index.search(" ".join(sys.argv[1:])):
+            print(f"  {match['score']:.2f}  {match['kind']:<9} {match['character_id']:<20} {match['text']}")
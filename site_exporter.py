@@ -0,0 +1,197 @@
+import os
+import gzip
+import json
+import hashlib
+from pathlib import Path
+import pandas as pd
+
+from frame_data import DATA_DIR, load_table, parse_frame_list
+
+# GitHub Pages serves the repository's docs/ folder
+SITE_DATA_DIR = Path.home() / "Documents" / "GitHub" / "SakurAI" / "docs" / "data"
+
+# Tables split into one shard per character
+SHARDED_TABLES = ["moves", "hitboxes", "throws"]
+
+# Character columns shown on the landing page roster
+ROSTER_COLUMNS = {
+    "character_id": "character_id",
+    "name": "name",
+    "attr_series": "series",
+    "param_Weight": "weight",
+    "param_RunSpeed": "run_speed",
+    "param_AirSpeed": "air_speed",
+    "param_FallSpeed": "fall_speed",
+    "param_Gravity": "gravity",
+    "param_Jumpsquat": "jumpsquat"
+}
+
+THROW_SUMMARY_COLUMNS = ["character_id", "move_name", "damage", "angle", "bkb", "kbg"]
+
+HASH_LENGTH = 12
+
+def to_json_bytes(df):
+    """
+    Serialize a DataFrame as compact column-oriented JSON.
+    Columns that are empty for every row are dropped, and frame lists become arrays.
+    """
+    df = df.dropna(axis=1, how="all")
+    if "frames" in df.columns and not pd.api.types.is_numeric_dtype(df["frames"]):
+        df = df.assign(frames=df["frames"].apply(parse_frame_list))
+    payload = json.loads(df.to_json(orient="split", index=False))
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+def write_shard(output_dir, relative_stem, data):
+    """
+    Write gzip-compressed JSON under a content-hashed file name so it can be cached forever.
+    Returns the manifest entry for the shard.
+    """
+    content_hash = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    relative_path = f"{relative_stem}.{content_hash}.json.gz"
+    shard_file = Path(output_dir) / relative_path
+    # mtime=0 keeps the compressed bytes identical between runs
+    compressed = gzip.compress(data, mtime=0)
+    # An existing shard is only trusted if it is complete; a run interrupted before
+    # the atomic rename below leaves a temp file, not a short shard
+    if not shard_file.exists() or shard_file.stat().st_size != len(compressed):
+        shard_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = f"{shard_file}.tmp{os.getpid()}"
+        with open(tmp_file, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_file, shard_file)
+    return {
+        "path": relative_path,
+        "hash": content_hash,
+        "bytes": shard_file.stat().st_size
+    }
+
+def manifest_paths(manifest):
+    """
+    Relative paths of every shard a manifest references.
+    """
+    paths = {entry["path"] for entry in manifest["summary"].values()}
+    for char_id, shards in manifest["characters"].items():
+        paths.update(manifest["shard_path"].format(character_id=char_id, table=table_name, hash=content_hash)
+                     for table_name, content_hash in shards.items())
+    return paths
+
+def build_roster_summary(characters_df, tables):
+    """
+    One row per character with the headline attributes and row counts for each table.
+    """
+    columns = [c for c in ROSTER_COLUMNS if c in characters_df.columns]
+    roster = characters_df[columns].rename(columns=ROSTER_COLUMNS)
+    for table_name, df in tables.items():
+        counts = df.groupby("character_id").size() if df is not None else pd.Series(dtype=int)
+        roster[f"{table_name}_count"] = roster["character_id"].map(counts).fillna(0).astype(int)
+    moves_df = tables.get("moves")
+    if moves_df is not None and "faf" in moves_df.columns:
+        faf = pd.to_numeric(moves_df["faf"], errors="coerce")
+        fastest = faf[faf > 0].groupby(moves_df["character_id"]).min()
+        roster["fastest_faf"] = roster["character_id"].map(fastest)
+    return roster
+
+def build_throw_summary(throws_df):
+    """
+    Every throw in the game, sorted by damage, for the throw leaderboard.
+    """
+    columns = [c for c in THROW_SUMMARY_COLUMNS if c in throws_df.columns]
+    summary = throws_df[columns].copy()
+    summary["damage"] = pd.to_numeric(summary["damage"], errors="coerce")
+    return summary.sort_values("damage", ascending=False, kind="stable")
+
+def export_site(data_dir=DATA_DIR, output_dir=SITE_DATA_DIR):
+    """
+    Export the dataset as per-character, per-table compressed JSON shards plus a small
+    manifest and precomputed summary tables for the GitHub Pages frontend.
+
+    Layout:
+        manifest.json                          - entry point, fetched on first paint; lists
+                                                 the content hash of every shard
+        summary/roster.<hash>.json.gz          - landing page roster
+        summary/throws.<hash>.json.gz          - throw leaderboard
+        characters/<id>/<table>.<hash>.json.gz - one shard per character and table
+
+    Shards that drop out of the manifest are deleted one export later, so pages
+    still using the previous manifest keep working.
+    """
+    print("\nExporting static site data...")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    characters_df = load_table("characters", data_dir)
+    if characters_df is None:
+        print("Error: characters.csv is required for the site export.")
+        return None
+    tables = {name: load_table(name, data_dir) for name in SHARDED_TABLES}
+
+    manifest = {
+        "format": "json+gzip",
+        "version": None,
+        "shard_path": "characters/{character_id}/{table}.{hash}.json.gz",
+        "summary": {},
+        "characters": {}
+    }
+    if "attr_version" in characters_df.columns:
+        versions = characters_df["attr_version"].dropna()
+        if not versions.empty:
+            manifest["version"] = str(versions.mode().iloc[0])
+
+    roster = build_roster_summary(characters_df, tables)
+    manifest["summary"]["roster"] = write_shard(output_dir, "summary/roster", to_json_bytes(roster))
+    if tables.get("throws") is not None:
+        throws = build_throw_summary(tables["throws"])
+        manifest["summary"]["throws"] = write_shard(output_dir, "summary/throws", to_json_bytes(throws))
+
+    grouped = {name: dict(tuple(df.groupby("character_id", sort=False)))
+               for name, df in tables.items() if df is not None}
+    for char_id in characters_df["character_id"]:
+        shards = {}
+        for table_name, groups in grouped.items():
+            rows = groups.get(char_id)
+            if rows is None or rows.empty:
+                continue
+            rows = rows.drop(columns=["character_id"])
+            entry = write_shard(output_dir, f"characters/{char_id}/{table_name}", to_json_bytes(rows))
+            # Only the hash is listed per shard; the path follows manifest["shard_path"]
+            shards[table_name] = entry["hash"]
+        manifest["characters"][char_id] = shards
+
+    manifest_file = output_dir / "manifest.json"
+    # Pages that loaded the previous manifest may still fetch its shards, so those
+    # are kept for one more export
+    previous_paths = set()
+    if manifest_file.exists():
+        try:
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                previous_paths = manifest_paths(json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass
+
+    # Every page load fetches the manifest, so replace it atomically
+    tmp_file = f"{manifest_file}.tmp{os.getpid()}"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_file, manifest_file)
+
+    # Remove shards referenced by neither the new nor the previous manifest
+    referenced = manifest_paths(manifest)
+    keep = referenced | previous_paths
+    removed = 0
+    for shard_file in output_dir.rglob("*.json.gz"):
+        if shard_file.relative_to(output_dir).as_posix() not in keep:
+            os.remove(shard_file)
+            removed += 1
+    # Temp files left behind by an interrupted export
+    for tmp_file in [*output_dir.rglob("*.json.gz.tmp*"), *output_dir.glob("manifest.json.tmp*")]:
+        os.remove(tmp_file)
+
+    total_bytes = sum((output_dir / path).stat().st_size for path in referenced)
+    print(f"Wrote manifest ({manifest_file.stat().st_size} bytes) and {len(referenced)} shards "
+          f"({total_bytes} bytes) to {output_dir}")
+    if removed:
+        print(f"Removed {removed} stale shards")
+    return manifest
+
+if __name__ == "__main__":
+    export_site()
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from frame_data import DATA_DIR, HITBOX_PARAMS_TABLE, classify_move, parse_frame_list
+
+DB_FILE_NAME = "frame_data.db"
+
+# Tables in load order with their primary keys
+TABLE_KEYS = {
+    "characters": ["character_id"],
+    "moves": ["character_id", "move_index"],
+    HITBOX_PARAMS_TABLE: ["param_id"],
+    "hitboxes": ["character_id", "move_index", "hitbox_index"],
+    "throws": ["character_id", "move_index", "throw_index"]
+}
+
+# Secondary indexes: (table, columns)
+SECONDARY_INDEXES = [
+    ("moves", ["name"]),
+    ("moves", ["value"]),
+    ("moves", ["type"]),
+    ("moves", ["move_type", "startup"]),
+    ("moves", ["startup"]),
+    ("hitboxes", ["param_id"]),
+    ("characters", ["game_name"]),
+    ("characters", ["normalized_name"])
+]
+
+def sqlite_type(series):
+    """
+    Map a pandas column dtype to an SQLite column type.
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    return "TEXT"
+
+def to_sql_values(df):
+    """
+    Convert a DataFrame to a list of row tuples with NaN mapped to NULL.
+    """
+    df = df.astype(object).where(df.notna(), None)
+    rows = []
+    for row in df.itertuples(index=False, name=None):
+        rows.append(tuple(v.item() if isinstance(v, np.generic) else v for v in row))
+    return rows
+
+def add_startup_column(moves_df, hitboxes_df, throws_df):
+    """
+    Derive each move's first active frame from its hitboxes (or its throw release frame)
+    and its coarse move type from the move name.
+    """
+    moves_df = moves_df.copy()
+    startups = []
+    for df in (hitboxes_df, throws_df):
+        if df is None or df.empty or "frames" not in df.columns:
+            continue
+        first = df["frames"].apply(lambda f: min(parse_frame_list(f), default=np.nan))
+        startups.append(first.groupby([df["character_id"], df["move_index"]]).min())
+    if startups:
+        startup = pd.concat(startups).groupby(level=[0, 1]).min().rename("startup")
+        moves_df = moves_df.merge(startup, left_on=["character_id", "move_index"],
+                                  right_index=True, how="left")
+    else:
+        moves_df["startup"] = np.nan
+    moves_df["move_type"] = moves_df["name"].apply(classify_move)
+    return moves_df
+
+def empty_table(keys):
+    """
+    An empty table with only its key columns, for tables missing from the export.
+    """
+    return pd.DataFrame({key: pd.Series(dtype=str if key == "character_id" else "int64") for key in keys})
+
+def create_table(conn, table_name, df, keys):
+    columns = ", ".join(f'"{col}" {sqlite_type(df[col])}' for col in df.columns)
+    key_list = ", ".join(f'"{key}"' for key in keys)
+    conn.execute(f'CREATE TABLE "{table_name}" ({columns}, PRIMARY KEY ({key_list}))')
+
+def export_to_sqlite(data_dir=DATA_DIR, db_path=None):
+    """
+    Publish the CSV tables as an indexed SQLite database.
+
+    All rows are bulk-loaded in a single transaction into a temporary file, indexes
+    are built after the load, and the finished file replaces the old database
+    atomically so readers never see a partial export.
+    """
+    print("\nExporting data to SQLite...")
+    data_dir = Path(data_dir)
+    db_path = Path(db_path) if db_path else data_dir / DB_FILE_NAME
+
+    # Hitboxes are stored as-is (interned if hitbox_params.csv exists). Missing tables
+    # are created empty so every table and view FrameDB queries always exists.
+    if not (data_dir / "moves.csv").exists():
+        print("Error: moves.csv is required for the SQLite export.")
+        return None
+    tables = {}
+    for table_name, keys in TABLE_KEYS.items():
+        csv_file = data_dir / f"{table_name}.csv"
+        if csv_file.exists():
+            tables[table_name] = pd.read_csv(csv_file)
+        else:
+            print(f"Warning: Table '{csv_file}' not found, creating it empty.")
+            tables[table_name] = empty_table(keys)
+    tables["moves"] = add_startup_column(tables["moves"], tables.get("hitboxes"), tables.get("throws"))
+
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    if tmp_path.exists():
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        with conn:
+            for table_name, df in tables.items():
+                keys = TABLE_KEYS[table_name]
+                duplicated = df.duplicated(keys)
+                if duplicated.any():
+                    print(f"Warning: Dropped {int(duplicated.sum())} rows with duplicate primary keys "
+                          f"from {table_name}")
+                    df = df[~duplicated]
+                create_table(conn, table_name, df, keys)
+                placeholders = ", ".join("?" for _ in df.columns)
+                conn.executemany(f'INSERT INTO "{table_name}" VALUES ({placeholders})', to_sql_values(df))
+                print(f"Loaded {len(df)} rows into {table_name}")
+
+            for table_name, columns in SECONDARY_INDEXES:
+                if any(c not in tables[table_name].columns for c in columns):
+                    continue
+                index_name = f"idx_{table_name}_{'_'.join(columns)}"
+                column_list = ", ".join(f'"{c}"' for c in columns)
+                conn.execute(f'CREATE INDEX "{index_name}" ON "{table_name}" ({column_list})')
+
+            if "param_id" in tables["hitboxes"].columns:
+                param_columns = [c for c in tables[HITBOX_PARAMS_TABLE].columns if c != "param_id"]
+                select_list = ", ".join(["h.*"] + [f'p."{c}"' for c in param_columns])
+                conn.execute(f'CREATE VIEW hitboxes_wide AS SELECT {select_list} '
+                             f'FROM hitboxes h LEFT JOIN "{HITBOX_PARAMS_TABLE}" p ON p.param_id = h.param_id')
+            else:
+                conn.execute("CREATE VIEW hitboxes_wide AS SELECT * FROM hitboxes")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    print(f"SQLite database saved to {db_path}")
+    return db_path
+
+if __name__ == "__main__":
+    export_to_sqlite()